@@ -8,6 +8,7 @@ import signal
 import sys
 import time
 import io
+from concurrent.futures import ThreadPoolExecutor
 from decimal import Decimal, ROUND_DOWN, InvalidOperation
 from dataclasses import dataclass, asdict
 from datetime import datetime, timezone, timedelta
@@ -48,6 +49,31 @@ TELEGRAM_LOCAL_ENDPOINT = "http://localhost:3000/send-message"
 _last_telegram_total_balance_hour: str | None = None
 USDT_DECIMALS = 6
 USDT_QUANTIZER = Decimal("0.000001")
+# 内部转账到账确认：轮询资金账户余额的最长等待时间与间隔（秒）
+TRANSFER_SETTLE_TIMEOUT_SEC = 10
+TRANSFER_SETTLE_POLL_SEC = 0.5
+# 无法获取转账前余额时退回固定等待
+TRANSFER_SETTLE_FALLBACK_SEC = 3
+# 未找到任何账户配置时的提示
+NO_ACCOUNT_CONFIG_HELP = """未找到任何账户配置。
+
+请确保在 .env 文件中配置了以下至少一项：
+
+【交易账户配置（必需）】
+  GRVT_TRADING_API_KEY_1=你的trading_api_key
+  GRVT_TRADING_PRIVATE_KEY_1=你的trading_private_key
+  GRVT_TRADING_ACCOUNT_ID_1=你的trading_account_id
+
+【资金账户配置（可选，用于转账功能）】
+  GRVT_FUNDING_API_KEY_1=你的funding_api_key
+  GRVT_FUNDING_PRIVATE_KEY_1=你的funding_private_key
+  GRVT_FUNDING_ACCOUNT_ID_1=你的funding账户内部ID
+  GRVT_FUNDING_ACCOUNT_ADDRESS_1=你的funding账户地址（0x开头）
+
+【关联配置（用于转账功能）】
+  GRVT_RELATED_FUNDING_ACCOUNT_ID_1=你的funding账户地址（0x开头）
+  GRVT_RELATED_MAIN_ACCOUNT_ID_1=你的主账户ID
+"""
 
 
 class TelegramErrorHandler(logging.Handler):
@@ -436,27 +462,29 @@ def load_account_configs() -> List[AccountConfig]:
     """从环境变量加载所有账户配置（支持交易账户和资金账户独立配置）。"""
     accounts = []
     index = 1
+    # 一次性快照环境变量，循环内每个账户索引的读取都走普通字典
+    getenv = dict(os.environ).get
     
     while True:
         # 尝试读取交易账户配置
-        trading_api_key = os.getenv(f"GRVT_TRADING_API_KEY_{index}")
-        trading_private_key = os.getenv(f"GRVT_TRADING_PRIVATE_KEY_{index}")
-        trading_account_id = os.getenv(f"GRVT_TRADING_ACCOUNT_ID_{index}")
+        trading_api_key = getenv(f"GRVT_TRADING_API_KEY_{index}")
+        trading_private_key = getenv(f"GRVT_TRADING_PRIVATE_KEY_{index}")
+        trading_account_id = getenv(f"GRVT_TRADING_ACCOUNT_ID_{index}")
         
         # 尝试读取资金账户配置
-        funding_api_key = os.getenv(f"GRVT_FUNDING_API_KEY_{index}")
-        funding_private_key = os.getenv(f"GRVT_FUNDING_PRIVATE_KEY_{index}")
-        funding_account_id = os.getenv(f"GRVT_FUNDING_ACCOUNT_ID_{index}")  # 内部账户ID（用于API调用）
-        funding_address = os.getenv(f"GRVT_FUNDING_ACCOUNT_ADDRESS_{index}")  # 链上地址（用于外部转账）
+        funding_api_key = getenv(f"GRVT_FUNDING_API_KEY_{index}")
+        funding_private_key = getenv(f"GRVT_FUNDING_PRIVATE_KEY_{index}")
+        funding_account_id = getenv(f"GRVT_FUNDING_ACCOUNT_ID_{index}")  # 内部账户ID（用于API调用）
+        funding_address = getenv(f"GRVT_FUNDING_ACCOUNT_ADDRESS_{index}")  # 链上地址（用于外部转账）
         
         # 向后兼容：如果第一个账户不存在新格式，尝试读取旧格式
         if index == 1 and not trading_api_key:
-            old_api_key = os.getenv("GRVT_API_KEY")
-            old_trading_account_id = os.getenv("GRVT_TRADING_ACCOUNT_ID")
-            old_private_key = os.getenv("GRVT_PRIVATE_KEY")
-            old_transfer_api_key = os.getenv("GRVT_TRANSFER_API_KEY")
-            old_transfer_private_key = os.getenv("GRVT_TRANSFER_PRIVATE_KEY")
-            old_funding_account_id = os.getenv("GRVT_FUNDING_ACCOUNT_ID")
+            old_api_key = getenv("GRVT_API_KEY")
+            old_trading_account_id = getenv("GRVT_TRADING_ACCOUNT_ID")
+            old_private_key = getenv("GRVT_PRIVATE_KEY")
+            old_transfer_api_key = getenv("GRVT_TRANSFER_API_KEY")
+            old_transfer_private_key = getenv("GRVT_TRANSFER_PRIVATE_KEY")
+            old_funding_account_id = getenv("GRVT_FUNDING_ACCOUNT_ID")
             
             # 如果找到旧格式，转换为交易账户配置
             if old_api_key and old_trading_account_id:
@@ -470,19 +498,19 @@ def load_account_configs() -> List[AccountConfig]:
                 funding_account_id = old_funding_account_id
         
         # 读取关联配置和通用配置
-        related_trading_account_id = os.getenv(f"GRVT_RELATED_TRADING_ACCOUNT_ID_{index}")
+        related_trading_account_id = getenv(f"GRVT_RELATED_TRADING_ACCOUNT_ID_{index}")
         # related_funding_account_id 应该是地址，不是ID（虽然变量名是ID，但实际存储的是地址）
-        related_funding_account_id = os.getenv(f"GRVT_RELATED_FUNDING_ACCOUNT_ID_{index}")
+        related_funding_account_id = getenv(f"GRVT_RELATED_FUNDING_ACCOUNT_ID_{index}")
         # 向后兼容：如果没有配置 GRVT_RELATED_FUNDING_ACCOUNT_ID_X，尝试使用同索引的 funding_address
         if not related_funding_account_id:
             related_funding_account_id = funding_address
-        related_main_account_id = normalize_account_id(os.getenv(f"GRVT_RELATED_MAIN_ACCOUNT_ID_{index}"))
-        env = os.getenv(f"GRVT_ENV_{index}", os.getenv("GRVT_ENV", "prod"))
-        threshold_str = os.getenv(f"GRVT_THRESHOLD_{index}")
+        related_main_account_id = normalize_account_id(getenv(f"GRVT_RELATED_MAIN_ACCOUNT_ID_{index}"))
+        env = getenv(f"GRVT_ENV_{index}", getenv("GRVT_ENV", "prod"))
+        threshold_str = getenv(f"GRVT_THRESHOLD_{index}")
         
         # 向后兼容：读取旧格式的阈值
         if index == 1 and not threshold_str:
-            threshold_str = os.getenv("GRVT_THRESHOLD")
+            threshold_str = getenv("GRVT_THRESHOLD")
         
         # 解析限定值
         threshold = None
@@ -531,21 +559,7 @@ def load_account_configs() -> List[AccountConfig]:
         
         # 如果第一个索引都没有找到任何配置，提供详细的错误提示
         if index == 1 and not accounts:
-            error_msg = "未找到任何账户配置。\n"
-            error_msg += "\n请确保在 .env 文件中配置了以下至少一项：\n"
-            error_msg += "\n【交易账户配置（必需）】\n"
-            error_msg += "  GRVT_TRADING_API_KEY_1=你的trading_api_key\n"
-            error_msg += "  GRVT_TRADING_PRIVATE_KEY_1=你的trading_private_key\n"
-            error_msg += "  GRVT_TRADING_ACCOUNT_ID_1=你的trading_account_id\n"
-            error_msg += "\n【资金账户配置（可选，用于转账功能）】\n"
-            error_msg += "  GRVT_FUNDING_API_KEY_1=你的funding_api_key\n"
-            error_msg += "  GRVT_FUNDING_PRIVATE_KEY_1=你的funding_private_key\n"
-            error_msg += "  GRVT_FUNDING_ACCOUNT_ID_1=你的funding账户内部ID\n"
-            error_msg += "  GRVT_FUNDING_ACCOUNT_ADDRESS_1=你的funding账户地址（0x开头）\n"
-            error_msg += "\n【关联配置（用于转账功能）】\n"
-            error_msg += "  GRVT_RELATED_FUNDING_ACCOUNT_ID_1=你的funding账户地址（0x开头）\n"
-            error_msg += "  GRVT_RELATED_MAIN_ACCOUNT_ID_1=你的主账户ID\n"
-            raise ValueError(error_msg)
+            raise ValueError(NO_ACCOUNT_CONFIG_HELP)
         
         # 如果当前索引没有找到任何配置，停止
         if not trading_api_key and not funding_api_key:
@@ -728,6 +742,39 @@ def get_funding_account_balance(client: GrvtRawSync, currency: str = "USDT") ->
         return None
 
 
+def wait_for_funding_credit(
+    client: GrvtRawSync,
+    currency: str,
+    balance_before: float | None,
+    amount: float,
+) -> bool:
+    """等待资金账户到账：轮询余额直到不低于转账前余额 + 金额，或超时。
+
+    Args:
+        client: GRVT客户端（资金账户）
+        currency: 币种
+        balance_before: 转账前余额（None 时退回固定等待）
+        amount: 转入金额
+
+    Returns:
+        是否在超时前确认到账
+    """
+    if balance_before is None:
+        time.sleep(TRANSFER_SETTLE_FALLBACK_SEC)
+        return False
+    # 允许半个最小精度的浮点误差
+    target = balance_before + amount - 0.5 * 10 ** -USDT_DECIMALS
+    deadline = time.monotonic() + TRANSFER_SETTLE_TIMEOUT_SEC
+    while True:
+        balance = get_funding_account_balance(client, currency)
+        if balance is not None and balance >= target:
+            return True
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        time.sleep(min(TRANSFER_SETTLE_POLL_SEC, remaining))
+
+
 def get_trading_account_balance(
     client: GrvtRawSync, 
     currency: str = "USDT",
@@ -1889,6 +1936,30 @@ def transfer_funding_to_trading(
         return False, {"success": False, "error": {"exception": error_msg}, "message": error_msg}
 
 
+def query_transfer_balances(
+    from_trading_client: GrvtRawSync,
+    from_trading_config: AccountConfig,
+    to_trading_client: GrvtRawSync,
+    to_trading_config: AccountConfig,
+    from_funding_client: GrvtRawSync,
+    to_funding_client: GrvtRawSync,
+    currency: str = "USDT",
+) -> Tuple[Dict[str, float] | None, Dict[str, float] | None, float | None, float | None]:
+    """并发查询转账涉及的四个账户余额。
+
+    四个查询分别使用各自的客户端，互不依赖，并发执行只需等待最慢的一次往返。
+
+    Returns:
+        (from_trading, to_trading, from_funding, to_funding) 余额
+    """
+    with ThreadPoolExecutor(max_workers=4, thread_name_prefix="transfer-balance") as pool:
+        from_trading = pool.submit(get_account_summary, from_trading_client, from_trading_config, from_trading_config.name)
+        to_trading = pool.submit(get_account_summary, to_trading_client, to_trading_config, to_trading_config.name)
+        from_funding = pool.submit(get_funding_account_balance, from_funding_client, currency)
+        to_funding = pool.submit(get_funding_account_balance, to_funding_client, currency)
+        return from_trading.result(), to_trading.result(), from_funding.result(), to_funding.result()
+
+
 def transfer_between_trading_accounts_via_funding(
     from_trading_config: AccountConfig,
     from_funding_config: AccountConfig,
@@ -1968,10 +2039,11 @@ def transfer_between_trading_accounts_via_funding(
         to_funding_client = build_client(to_funding_config)
         
         # 获取转账前余额
-        from_trading_pre = get_account_summary(from_trading_client, from_trading_config, from_trading_config.name)
-        to_trading_pre = get_account_summary(to_trading_client, to_trading_config, to_trading_config.name)
-        from_funding_pre = get_funding_account_balance(from_funding_client, currency)
-        to_funding_pre = get_funding_account_balance(to_funding_client, currency)
+        from_trading_pre, to_trading_pre, from_funding_pre, to_funding_pre = query_transfer_balances(
+            from_trading_client, from_trading_config,
+            to_trading_client, to_trading_config,
+            from_funding_client, to_funding_client, currency,
+        )
         
         # 步骤1: A-trading → A-funding（使用A-trading的API key）
         logging.info("[Transfer] Step 1/3: %s → %s", 
@@ -2020,8 +2092,9 @@ def transfer_between_trading_accounts_via_funding(
         logging.info("[Transfer] Step 1/3: %s → %s (tx_id: %s)", 
                     from_trading_config.name, from_funding_config.name, step1_tx_id or "N/A")
         
-        # 等待一下，确保步骤1的转账完成（参考测试脚本）
-        time.sleep(3)
+        # 等待步骤1到账后再进行步骤2（轮询余额，超时后照常继续）
+        if not wait_for_funding_credit(from_funding_client, currency, from_funding_pre, amount):
+            logging.warning("[Transfer] Step 1/3 credit to %s not confirmed, continuing", from_funding_config.name)
         
         # 步骤2: A-funding → B-funding (外部转账，使用地址)
         logging.info("[Transfer] Step 2/3: %s → %s", 
@@ -2120,13 +2193,13 @@ def transfer_between_trading_accounts_via_funding(
             logging.warning("[Transfer] Funds are in %s funding account, manual intervention may be needed",
                           to_funding_config.name)
             
-            # 获取转账后余额
-            from_trading_post = get_account_summary(from_trading_client, from_trading_config, from_trading_config.name)
-            to_trading_post = get_account_summary(to_trading_client, to_trading_config, to_trading_config.name)
-            from_funding_post = get_funding_account_balance(from_funding_client, currency)
-            to_funding_post = get_funding_account_balance(to_funding_client, currency)
-            
+            # 转账后余额仅用于 DEBUG 日志，非 DEBUG 模式下省去这次查询
             if logging.getLogger().isEnabledFor(logging.DEBUG):
+                from_trading_post, to_trading_post, from_funding_post, to_funding_post = query_transfer_balances(
+                    from_trading_client, from_trading_config,
+                    to_trading_client, to_trading_config,
+                    from_funding_client, to_funding_client, currency,
+                )
                 transfer_log = {
                     "event_time": start_time,
                     "success": False,
@@ -2159,14 +2232,13 @@ def transfer_between_trading_accounts_via_funding(
         logging.info("[Transfer] Step 3/3: %s → %s (tx_id: %s)", 
                     to_funding_config.name, to_trading_config.name, step3_tx_id or "N/A")
         
-        # 获取转账后余额
-        from_trading_post = get_account_summary(from_trading_client, from_trading_config, from_trading_config.name)
-        to_trading_post = get_account_summary(to_trading_client, to_trading_config, to_trading_config.name)
-        from_funding_post = get_funding_account_balance(from_funding_client, currency)
-        to_funding_post = get_funding_account_balance(to_funding_client, currency)
-        
-        # 记录完整的转账日志（仅在 DEBUG 模式下）
+        # 记录完整的转账日志（仅在 DEBUG 模式下，转账后余额也只在此时查询）
         if logging.getLogger().isEnabledFor(logging.DEBUG):
+            from_trading_post, to_trading_post, from_funding_post, to_funding_post = query_transfer_balances(
+                from_trading_client, from_trading_config,
+                to_trading_client, to_trading_config,
+                from_funding_client, to_funding_client, currency,
+            )
             transfer_log = {
                 "event_time": start_time,
                 "success": True,
@@ -3052,7 +3124,7 @@ if __name__ == "__main__":
         sys.exit(1)
     except Exception as e:
         print(f"\n❌ 发生错误: {e}")
-        import traceback
-        traceback.print_exc()
+        # 通过 logging 记录堆栈：写入日志文件并触发 ERROR 告警，未初始化日志时回退到 stderr
+        logging.exception("未捕获异常，程序退出")
         sys.exit(1)
 
@@ -1,17 +1,23 @@
+import heapq
 import io
 import json
 import logging
 import os
 import random
+import re
 import signal
 import sys
+import threading
 import time
-from collections import deque
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor, wait
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
-from decimal import Decimal, ROUND_CEILING, ROUND_DOWN, InvalidOperation
+from decimal import Decimal, ROUND_DOWN, InvalidOperation
+from functools import lru_cache
+from operator import attrgetter
 from pathlib import Path
-from typing import Any, Deque, Dict, List, Optional
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
 
 import requests
 from dotenv import load_dotenv
@@ -29,6 +35,7 @@ from pysdk.grvt_raw_types import (
     ApiGetInstrumentRequest,
     ApiGetOrderRequest,
     ApiOpenOrdersRequest,
+    ApiOrderHistoryRequest,
     ApiOrderbookLevelsRequest,
     ApiPositionsRequest,
     EmptyRequest,
@@ -36,6 +43,7 @@ from pysdk.grvt_raw_types import (
     Order,
     OrderLeg,
     OrderMetadata,
+    OrderState,
     OrderStatus,
     Signature,
     TimeInForce,
@@ -49,16 +57,82 @@ if sys.platform == "win32":
 
 BEIJING_TZ = timezone(timedelta(hours=8))
 ORDER_PREFIX = "HEDGEV1"
+ORDER_PREFIX_TAG = f"{ORDER_PREFIX}_"
 ORDER_ID_MASK = 0xF000000000000000
 ORDER_ID_PREFIX = 0xE000000000000000
+ORDER_ID_ENTROPY_MASK = (1 << 58) - 1
+# Namespace prefix with account bit 59 and side bit 58, keyed by (account_label, side).
+ORDER_ID_BASE = {
+    (label, side): ORDER_ID_PREFIX | (acc_bit << 59) | (side_bit << 58)
+    for acc_bit, label in enumerate(("A", "B"))
+    for side_bit, side in enumerate(("buy", "sell"))
+}
 DEFAULT_LOOP_INTERVAL_SEC = 2
 DEFAULT_POST_ONLY_MAX_RETRY = 5
 DEFAULT_POST_ONLY_COOLDOWN_SEC = 300
 DEFAULT_PARTIAL_FILL_TIMEOUT_SEC = 1800
 DEFAULT_STUCK_HOURS = 6
 DEFAULT_MMR_ALERT_THRESHOLD = Decimal("0.70")
+DEC_ZERO = Decimal("0")
+DEC_ONE = Decimal(1)
+DEC_MICRO = Decimal("0.000001")
+DEC_DEFAULT_TICK = Decimal("0.1")
 DEFAULT_ORDERBOOK_DEPTH = 10
+DEFAULT_MAX_LOTS = 2048
+AUTH_REBUILD_MIN_INTERVAL_SEC = 5
+NS_PER_SEC = 1_000_000_000
+AUTH_REBUILD_MIN_INTERVAL_NS = AUTH_REBUILD_MIN_INTERVAL_SEC * NS_PER_SEC
+PROVISIONAL_ORDER_TIMEOUT_NS = 60 * NS_PER_SEC
+STALE_ORDER_NS = 3600 * NS_PER_SEC
+UNSEEN_ORDER_NS = 600 * NS_PER_SEC
+LOOP_ERROR_BACKOFF_MAX_NS = 60 * NS_PER_SEC
+# Four (account, side) combinations exist, so a cap above this always has a merge candidate.
+MIN_MAX_LOTS = 8
+LOT_COMPACT_THRESHOLD = 16
+CLIP_STEPS = 50
+ORDER_HISTORY_PROBE_LIMIT = 200
+CREATED_AT_KEY = attrgetter("created_at")
+EMPTY_REQUEST = EmptyRequest()
+POST_ONLY_REJECT_RE = re.compile(r"post|maker|would match|taker", re.IGNORECASE)
 TELEGRAM_LOCAL_ENDPOINT = "http://localhost:3000/send-message"
+PERPETUAL_KINDS = [Kind.PERPETUAL]
+AUTH_ERROR_STATUSES = (401, "401")
+AUTH_ERROR_CODES = (1000, "1000")
+AUTH_ERROR_MSG_TOKENS = ("authenticate", "unauthorized")
+CANCEL_GONE_MSG_TOKENS = ("not found", "does not exist", "already closed", "already canceled", "already cancelled")
+PLACEHOLDER_ORDER_IDS = frozenset({"", "0", "0x0", "0x00"})
+FALSEY_ENV_VALUES = frozenset({"0", "false", "no"})
+VALID_SIDES = frozenset({"buy", "sell"})
+VALID_POSITION_MODES = frozenset({"increase", "decrease"})
+TERMINAL_ORDER_STATUSES = frozenset({"FILLED", "CANCELLED", "REJECTED"})
+
+
+@lru_cache(maxsize=4096)
+def _parse_decimal(text: str) -> Optional[Decimal]:
+    # Decimal is immutable, so repeated price/size strings can share one instance.
+    try:
+        return Decimal(text)
+    except (InvalidOperation, ValueError):
+        return None
+
+
+@lru_cache(maxsize=32)
+def _decimal_quantum(decimals: int) -> Decimal:
+    return DEC_ONE.scaleb(-decimals)
+
+
+@lru_cache(maxsize=8192)
+def _is_strategy_client_id(client_order_id: str) -> bool:
+    if client_order_id.startswith(ORDER_PREFIX_TAG):
+        return True
+    # Any integer whose masked bits equal ORDER_ID_PREFIX needs 20+ characters in decimal.
+    if len(client_order_id) < 20:
+        return False
+    try:
+        value = int(client_order_id)
+    except ValueError:
+        return False
+    return (value & ORDER_ID_MASK) == ORDER_ID_PREFIX
 
 
 @dataclass
@@ -76,14 +150,13 @@ class SymbolConfig:
     instrument: str
     enabled: bool
     order_notional_usdt: Decimal
-    imbalance_limit_usdt: Decimal
     max_total_position_usdt: Decimal
     min_total_position_usdt: Decimal
     a_side_when_equal: str
     position_mode: str
 
 
-@dataclass
+@dataclass(slots=True)
 class FillLot:
     source_account: str
     source_side: str
@@ -93,7 +166,7 @@ class FillLot:
     synthetic: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class ManagedOrder:
     order_id: str
     client_order_id: str
@@ -103,11 +176,11 @@ class ManagedOrder:
     price: Decimal
     size: Decimal
     notional_usdt: Decimal
-    created_at: float
+    created_at: int
     strategy_owned: bool
-    last_seen_at: float = 0.0
+    last_seen_at: int = 0
     applied_traded_size: Decimal = Decimal("0")
-    partial_since: Optional[float] = None
+    partial_since: Optional[int] = None
     closed: bool = False
     close_reason: Optional[str] = None
 
@@ -117,7 +190,20 @@ class SymbolState:
     config: SymbolConfig
     lots: Deque[FillLot] = field(default_factory=deque)
     managed_orders: Dict[str, ManagedOrder] = field(default_factory=dict)
-    cooldown_until: float = 0.0
+    by_client_id: Dict[str, str] = field(default_factory=dict)
+    spent_lots: int = 0
+    instrument_info: Any = None
+    tick: Decimal = DEC_ZERO
+    size_step: Decimal = DEC_ZERO
+    size_quantum: Decimal = DEC_ZERO
+    min_size: Decimal = DEC_ZERO
+    # Per-tick view of live strategy orders; reset to None whenever managed orders change.
+    active_orders: Optional[List[ManagedOrder]] = None
+    # Active strategy orders per account_label.
+    active_counts: Counter[str] = field(default_factory=Counter)
+    # Open strategy notional per (account_label, side); unlike active_orders it ignores staleness.
+    open_notional: Dict[Tuple[str, str], Decimal] = field(default_factory=dict)
+    cooldown_until: int = 0
     unhedged_since: Optional[float] = None
     stuck_alert_sent: bool = False
     non_strategy_alerted: bool = False
@@ -125,7 +211,7 @@ class SymbolState:
 
 @dataclass
 class AlertState:
-    last_sent_by_key: Dict[str, float] = field(default_factory=dict)
+    last_sent_by_key: Dict[str, int] = field(default_factory=dict)
     last_daily_report_day: Optional[str] = None
 
 
@@ -138,6 +224,10 @@ class PositionSnapshot:
     abs_notional: Decimal = Decimal("0")
 
 
+# Shared read-only stand-in for symbols with no open position.
+EMPTY_POSITION = PositionSnapshot()
+
+
 @dataclass
 class AccountRuntime:
     label: str
@@ -145,6 +235,9 @@ class AccountRuntime:
     client: Any
     signer: Any
     instruments: Dict[str, Any] = field(default_factory=dict)
+    positions_req: Optional[ApiPositionsRequest] = None
+    open_orders_req: Optional[ApiOpenOrdersRequest] = None
+    last_rebuild_at: Optional[int] = None
 
 
 class DualMakerHedgeEngine:
@@ -152,6 +245,8 @@ class DualMakerHedgeEngine:
         load_dotenv(override=True)
         self._setup_logging()
         self.stop_flag = False
+        # Set by signal handlers so loop waits wake up immediately on stop.
+        self._stop_event = threading.Event()
         self.alert_state = AlertState()
         self.symbol_states: Dict[str, SymbolState] = {}
         self.loop_interval_sec = int(os.getenv("GRVT_HEDGE_LOOP_INTERVAL_SEC", str(DEFAULT_LOOP_INTERVAL_SEC)))
@@ -160,6 +255,8 @@ class DualMakerHedgeEngine:
         self.partial_fill_timeout_sec = int(
             os.getenv("GRVT_HEDGE_PARTIAL_FILL_TIMEOUT_SEC", str(DEFAULT_PARTIAL_FILL_TIMEOUT_SEC))
         )
+        self.post_only_cooldown_ns = self.post_only_cooldown_sec * NS_PER_SEC
+        self.partial_fill_timeout_ns = self.partial_fill_timeout_sec * NS_PER_SEC
         self.stuck_hours = int(os.getenv("GRVT_HEDGE_STUCK_HOURS", str(DEFAULT_STUCK_HOURS)))
         self.mmr_alert_threshold = self._to_decimal(
             os.getenv("GRVT_HEDGE_MMR_ALERT_THRESHOLD", str(DEFAULT_MMR_ALERT_THRESHOLD)),
@@ -172,17 +269,42 @@ class DualMakerHedgeEngine:
             os.getenv("GRVT_HEDGE_SINGLE_ORDER_DIFF_THRESHOLD_USDT", "20"),
             Decimal("20"),
         )
+        self.max_lots = max(MIN_MAX_LOTS, int(os.getenv("GRVT_HEDGE_MAX_LOTS") or DEFAULT_MAX_LOTS))
         self.sdk_log_level = os.getenv("GRVT_HEDGE_SDK_LOG_LEVEL", "ERROR").upper()
-        self.cancel_on_stop = str(os.getenv("GRVT_HEDGE_CANCEL_ON_STOP", "1")).strip().lower() not in {"0", "false", "no"}
+        self.cancel_on_stop = str(os.getenv("GRVT_HEDGE_CANCEL_ON_STOP", "1")).strip().lower() not in FALSEY_ENV_VALUES
         self.stop_keep_strategy_orders = max(0, int(os.getenv("GRVT_HEDGE_STOP_KEEP_STRATEGY_ORDERS", "0") or "0"))
         self.max_runtime_sec = max(0, int(os.getenv("GRVT_HEDGE_MAX_RUNTIME_SEC", "0") or "0"))
-        self.started_at = time.time()
-        if not os.getenv("CHAT_ID") or not os.getenv("API_KEY"):
+        self.loop_interval_ns = max(0, self.loop_interval_sec) * NS_PER_SEC
+        self._consecutive_errors = 0
+        self.started_at = time.monotonic_ns()
+        self._run_deadline_ns: Optional[int] = (
+            self.started_at + self.max_runtime_sec * NS_PER_SEC if self.max_runtime_sec > 0 else None
+        )
+        self._chat_id = os.getenv("CHAT_ID") or ""
+        self._tg_api_key = os.getenv("API_KEY") or ""
+        if not self._chat_id or not self._tg_api_key:
             logging.warning("Telegram alert is not fully configured: CHAT_ID/API_KEY missing")
+        self._tg_headers = {"Content-Type": "application/json", "X-API-Key": self._tg_api_key}
+        self._tg_session = requests.Session()
+        # Snapshot workers raise alerts too: one lock for the cooldown map, another for the
+        # shared session so a slow send never blocks cooldown checks.
+        self._alert_lock = threading.Lock()
+        self._tg_send_lock = threading.Lock()
+        self._create_time_sec = -1
+        self._create_time_prefix = ""
+        self._book_requests: Dict[str, ApiOrderbookLevelsRequest] = {}
+        # Instrument map handed to sign_order; shared by both accounts, filled as symbols load.
+        self._sign_instruments: Dict[str, Any] = {}
         self.instrument_alias_map: Dict[str, str] = {}
         self.accounts = self._load_two_trading_accounts()
         self.instrument_alias_map = self._load_instrument_aliases()
+        self._canonical_instruments: List[str] = sorted(set(self.instrument_alias_map.values()))
+        self._canonical_instruments_upper: List[str] = [name.upper() for name in self._canonical_instruments]
         self.symbol_states = self._load_symbol_states()
+        # The symbol set is fixed after load; iterate a tuple snapshot in the main loop.
+        self._symbol_states_tuple = tuple(self.symbol_states.values())
+        # One worker per account: each account's SDK client stays on a single thread per tick.
+        self._snapshot_pool = ThreadPoolExecutor(max_workers=len(self.accounts), thread_name_prefix="grvt-snapshot")
         signal.signal(signal.SIGINT, self._handle_signal)
         signal.signal(signal.SIGTERM, self._handle_signal)
 
@@ -206,8 +328,17 @@ class DualMakerHedgeEngine:
             return
         logging.info("Received signal %s, stopping hedge engine...", signum)
         self.stop_flag = True
+        self._stop_event.set()
 
     def _to_decimal(self, value: Any, default: Decimal) -> Decimal:
+        value_type = type(value)
+        if value_type is Decimal:
+            return value
+        if value_type is str:
+            parsed = _parse_decimal(value)
+            return default if parsed is None else parsed
+        if value_type is int:
+            return Decimal(value)
         try:
             return Decimal(str(value))
         except (InvalidOperation, ValueError, TypeError):
@@ -229,6 +360,8 @@ class DualMakerHedgeEngine:
                 config=cfg,
                 client=client,
                 signer=Account.from_key(cfg.private_key),
+                positions_req=ApiPositionsRequest(sub_account_id=cfg.account_id, kind=PERPETUAL_KINDS),
+                open_orders_req=ApiOpenOrdersRequest(sub_account_id=cfg.account_id, kind=PERPETUAL_KINDS),
             )
             result[label] = runtime
         return result
@@ -298,10 +431,9 @@ class DualMakerHedgeEngine:
         if not self.accounts:
             return {}
         runtime = self.accounts.get("A") or next(iter(self.accounts.values()))
-        response = runtime.client.get_all_instruments_v1(ApiGetAllInstrumentsRequest(is_active=True))
-        if isinstance(response, GrvtError) and self._is_auth_error(response):
-            runtime.client = self._build_client(runtime.config)
-            response = runtime.client.get_all_instruments_v1(ApiGetAllInstrumentsRequest(is_active=True))
+        response = self._call_with_auth_retry(
+            runtime, "get_all_instruments_v1", ApiGetAllInstrumentsRequest(is_active=True)
+        )
         if isinstance(response, GrvtError):
             logging.warning(
                 "Failed to preload instruments, continue without alias map: account=%s code=%s status=%s msg=%s",
@@ -316,8 +448,7 @@ class DualMakerHedgeEngine:
             name = str(getattr(item, "instrument", "")).strip()
             if not name:
                 continue
-            alias[name] = name
-            alias[name.upper()] = name
+            name = sys.intern(name)
             alias[name.lower()] = name
         logging.info("Loaded %d active instruments for symbol normalization", len(set(alias.values())))
         return alias
@@ -326,14 +457,15 @@ class DualMakerHedgeEngine:
         if not self.instrument_alias_map:
             return []
         token = raw_instrument.strip().split("_")[0].upper()
-        canonical = sorted(set(self.instrument_alias_map.values()))
+        canonical = self._canonical_instruments
         if not token:
             return canonical[:limit]
         prefix = f"{token}_"
-        suggestions = [name for name in canonical if name.upper().startswith(prefix)]
+        indexed = list(zip(canonical, self._canonical_instruments_upper))
+        suggestions = [name for name, upper in indexed if upper.startswith(prefix)]
         if len(suggestions) < limit:
-            for name in canonical:
-                if token in name.upper() and name not in suggestions:
+            for name, upper in indexed:
+                if token in upper and name not in suggestions:
                     suggestions.append(name)
                 if len(suggestions) >= limit:
                     break
@@ -346,13 +478,9 @@ class DualMakerHedgeEngine:
         if instrument.upper().endswith("_PERP"):
             instrument = f"{instrument[:-5]}_Perp"
         if not self.instrument_alias_map:
-            return instrument
-        resolved = (
-            self.instrument_alias_map.get(instrument)
-            or self.instrument_alias_map.get(instrument.upper())
-            or self.instrument_alias_map.get(instrument.lower())
-        )
-        return resolved or ""
+            return sys.intern(instrument)
+        # Alias map is keyed by lower-cased name only; values are already interned.
+        return self.instrument_alias_map.get(instrument.lower(), "")
 
     def _load_symbol_states(self) -> Dict[str, SymbolState]:
         symbols_file = os.getenv("GRVT_HEDGE_SYMBOLS_FILE", "config/hedge_symbols.json").strip()
@@ -386,19 +514,23 @@ class DualMakerHedgeEngine:
                 raise RuntimeError(f"Unknown instrument '{raw_instrument}'{suffix}")
             if raw_instrument != instrument:
                 logging.info("Normalized instrument %s -> %s", raw_instrument, instrument)
+            if "imbalance_limit_usdt" in item:
+                logging.warning(
+                    "%s: imbalance_limit_usdt is no longer used (the per-account order cap bounds imbalance); ignoring",
+                    instrument,
+                )
             cfg = SymbolConfig(
                 instrument=instrument,
                 enabled=bool(item.get("enabled", True)),
                 order_notional_usdt=self._to_decimal(item.get("order_notional_usdt"), Decimal("1000")),
-                imbalance_limit_usdt=self._to_decimal(item.get("imbalance_limit_usdt"), Decimal("1000")),
                 max_total_position_usdt=self._to_decimal(item.get("max_total_position_usdt"), Decimal("20000")),
                 min_total_position_usdt=self._to_decimal(item.get("min_total_position_usdt"), Decimal("0")),
                 a_side_when_equal=str(item.get("a_side_when_equal", "buy")).strip().lower(),
                 position_mode=str(item.get("position_mode", "increase")).strip().lower(),
             )
-            if cfg.a_side_when_equal not in {"buy", "sell"}:
+            if cfg.a_side_when_equal not in VALID_SIDES:
                 raise RuntimeError(f"{instrument} invalid a_side_when_equal: {cfg.a_side_when_equal}")
-            if cfg.position_mode not in {"increase", "decrease"}:
+            if cfg.position_mode not in VALID_POSITION_MODES:
                 raise RuntimeError(f"{instrument} invalid position_mode: {cfg.position_mode}")
             if cfg.max_total_position_usdt < 0:
                 raise RuntimeError(f"{instrument} invalid max_total_position_usdt: {cfg.max_total_position_usdt}")
@@ -409,7 +541,7 @@ class DualMakerHedgeEngine:
                     f"{instrument} min_total_position_usdt > max_total_position_usdt: "
                     f"{cfg.min_total_position_usdt} > {cfg.max_total_position_usdt}"
                 )
-            states[instrument] = SymbolState(config=cfg)
+            states[instrument] = SymbolState(config=cfg, lots=deque(maxlen=self.max_lots))
         return states
 
     def _opposite_side(self, side: str) -> str:
@@ -444,23 +576,41 @@ class DualMakerHedgeEngine:
         return {"A": side_a, "B": self._opposite_side(side_a)}
 
     def _send_telegram(self, message: str) -> None:
-        chat_id = os.getenv("CHAT_ID")
-        api_key = os.getenv("API_KEY")
-        if not chat_id or not api_key:
+        if not self._chat_id or not self._tg_api_key:
             return
-        headers = {"Content-Type": "application/json", "X-API-Key": api_key}
-        payload = {"chatId": chat_id, "message": message}
+        payload = {"chatId": self._chat_id, "message": message}
         try:
-            requests.post(TELEGRAM_LOCAL_ENDPOINT, json=payload, headers=headers, timeout=6)
+            with self._tg_send_lock:
+                self._tg_session.post(TELEGRAM_LOCAL_ENDPOINT, json=payload, headers=self._tg_headers, timeout=6)
         except Exception as exc:
             logging.debug("Telegram alert failed: %s", exc)
 
+    def _claim_alert_slot(self, alert_key: str, cooldown_sec: int) -> bool:
+        now = time.monotonic_ns()
+        with self._alert_lock:
+            last_ts = self.alert_state.last_sent_by_key.get(alert_key)
+            if last_ts is not None and now - last_ts < cooldown_sec * NS_PER_SEC:
+                return False
+            self.alert_state.last_sent_by_key[alert_key] = now
+        return True
+
     def _notify(self, title: str, message: str, alert_key: str, cooldown_sec: int = 300) -> None:
-        now = time.time()
-        last_ts = self.alert_state.last_sent_by_key.get(alert_key, 0.0)
-        if now - last_ts < cooldown_sec:
+        if not self._claim_alert_slot(alert_key, cooldown_sec):
             return
-        self.alert_state.last_sent_by_key[alert_key] = now
+        self._send_telegram(f"{title}\n{message}")
+        logging.warning("%s | %s", title, message)
+
+    def _notify_lazy(
+        self,
+        title: str,
+        alert_key: str,
+        cooldown_sec: int,
+        msg_factory: Callable[[], str],
+    ) -> None:
+        # Same as _notify, but the message is only formatted when the alert is actually sent.
+        if not self._claim_alert_slot(alert_key, cooldown_sec):
+            return
+        message = msg_factory()
         self._send_telegram(f"{title}\n{message}")
         logging.warning("%s | %s", title, message)
 
@@ -468,55 +618,70 @@ class DualMakerHedgeEngine:
         return
 
     def _is_auth_error(self, response: GrvtError) -> bool:
+        if getattr(response, "status", None) in AUTH_ERROR_STATUSES:
+            return True
+        if getattr(response, "code", None) in AUTH_ERROR_CODES:
+            return True
         msg = str(getattr(response, "message", "") or "").lower()
-        code = str(getattr(response, "code", "") or "")
-        status = str(getattr(response, "status", "") or "")
-        return status == "401" or code == "1000" or "authenticate" in msg or "unauthorized" in msg
+        return any(token in msg for token in AUTH_ERROR_MSG_TOKENS)
+
+    def _rebuild_client(self, runtime: AccountRuntime) -> bool:
+        # Throttle rebuilds so an auth outage does not recreate the client on every call.
+        now = time.monotonic_ns()
+        if runtime.last_rebuild_at is not None and now - runtime.last_rebuild_at < AUTH_REBUILD_MIN_INTERVAL_NS:
+            return False
+        runtime.client = self._build_client(runtime.config)
+        runtime.last_rebuild_at = now
+        return True
+
+    def _call_with_auth_retry(self, runtime: AccountRuntime, api_name: str, request: Any) -> Any:
+        response = getattr(runtime.client, api_name)(request)
+        if isinstance(response, GrvtError) and self._is_auth_error(response) and self._rebuild_client(runtime):
+            response = getattr(runtime.client, api_name)(request)
+        return response
 
     def _fetch_instrument(self, runtime: AccountRuntime, instrument: str) -> Optional[Any]:
         if instrument in runtime.instruments:
             return runtime.instruments[instrument]
-        response = runtime.client.get_instrument_v1(ApiGetInstrumentRequest(instrument=instrument))
-        if isinstance(response, GrvtError) and self._is_auth_error(response):
-            runtime.client = self._build_client(runtime.config)
-            response = runtime.client.get_instrument_v1(ApiGetInstrumentRequest(instrument=instrument))
+        response = self._call_with_auth_retry(
+            runtime, "get_instrument_v1", ApiGetInstrumentRequest(instrument=instrument)
+        )
         if isinstance(response, GrvtError):
-            self._notify(
+            self._notify_lazy(
                 title=f"GRVT hedge instrument query failed {instrument}",
-                message=f"account={runtime.config.name} code={response.code} status={response.status} msg={response.message}",
                 alert_key=f"instrument:{runtime.config.name}:{instrument}",
                 cooldown_sec=600,
+                msg_factory=lambda: (
+                    f"account={runtime.config.name} code={response.code} status={response.status} msg={response.message}"
+                ),
             )
             return None
         runtime.instruments[instrument] = response.result
         return response.result
 
     def _query_positions(self, runtime: AccountRuntime) -> Dict[str, PositionSnapshot]:
-        response = runtime.client.positions_v1(
-            ApiPositionsRequest(sub_account_id=runtime.config.account_id, kind=[Kind.PERPETUAL])
-        )
-        if isinstance(response, GrvtError) and self._is_auth_error(response):
-            runtime.client = self._build_client(runtime.config)
-            response = runtime.client.positions_v1(
-                ApiPositionsRequest(sub_account_id=runtime.config.account_id, kind=[Kind.PERPETUAL])
-            )
+        response = self._call_with_auth_retry(runtime, "positions_v1", runtime.positions_req)
         result: Dict[str, PositionSnapshot] = {}
         if isinstance(response, GrvtError):
-            self._notify(
+            self._notify_lazy(
                 title=f"GRVT hedge positions failed {runtime.config.name}",
-                message=f"code={response.code} status={response.status} msg={response.message}",
                 alert_key=f"positions:{runtime.config.name}",
                 cooldown_sec=120,
+                msg_factory=lambda: f"code={response.code} status={response.status} msg={response.message}",
             )
             return result
         for pos in response.result:
-            size = self._to_decimal(getattr(pos, "size", "0"), Decimal("0"))
-            mark_price = self._to_decimal(getattr(pos, "mark_price", "0"), Decimal("0"))
-            entry_price = self._to_decimal(getattr(pos, "entry_price", "0"), Decimal("0"))
+            instrument = getattr(pos, "instrument", "")
+            # Only configured symbols are read downstream; skip Decimal work for the rest.
+            if instrument not in self.symbol_states:
+                continue
+            size = self._to_decimal(getattr(pos, "size", "0"), DEC_ZERO)
+            mark_price = self._to_decimal(getattr(pos, "mark_price", "0"), DEC_ZERO)
+            entry_price = self._to_decimal(getattr(pos, "entry_price", "0"), DEC_ZERO)
             if mark_price <= 0:
                 mark_price = entry_price
             signed_notional = size * mark_price
-            result[getattr(pos, "instrument")] = PositionSnapshot(
+            result[instrument] = PositionSnapshot(
                 size=size,
                 mark_price=mark_price,
                 entry_price=entry_price,
@@ -526,21 +691,14 @@ class DualMakerHedgeEngine:
         return result
 
     def _query_open_orders(self, runtime: AccountRuntime) -> Dict[str, List[Order]]:
-        response = runtime.client.open_orders_v1(
-            ApiOpenOrdersRequest(sub_account_id=runtime.config.account_id, kind=[Kind.PERPETUAL])
-        )
-        if isinstance(response, GrvtError) and self._is_auth_error(response):
-            runtime.client = self._build_client(runtime.config)
-            response = runtime.client.open_orders_v1(
-                ApiOpenOrdersRequest(sub_account_id=runtime.config.account_id, kind=[Kind.PERPETUAL])
-            )
+        response = self._call_with_auth_retry(runtime, "open_orders_v1", runtime.open_orders_req)
         grouped: Dict[str, List[Order]] = {}
         if isinstance(response, GrvtError):
-            self._notify(
+            self._notify_lazy(
                 title=f"GRVT hedge open orders failed {runtime.config.name}",
-                message=f"code={response.code} status={response.status} msg={response.message}",
                 alert_key=f"open_orders:{runtime.config.name}",
                 cooldown_sec=120,
+                msg_factory=lambda: f"code={response.code} status={response.status} msg={response.message}",
             )
             return grouped
         for order in response.result:
@@ -555,24 +713,18 @@ class DualMakerHedgeEngine:
             return False
         if self._is_placeholder_order_id(order_id):
             return True
-        response = runtime.client.cancel_order_v1(
+        response = self._call_with_auth_retry(
+            runtime,
+            "cancel_order_v1",
             ApiCancelOrderRequest(
                 sub_account_id=runtime.config.account_id,
                 order_id=order_id,
-            )
+            ),
         )
-        if isinstance(response, GrvtError) and self._is_auth_error(response):
-            runtime.client = self._build_client(runtime.config)
-            response = runtime.client.cancel_order_v1(
-                ApiCancelOrderRequest(
-                    sub_account_id=runtime.config.account_id,
-                    order_id=order_id,
-                )
-            )
         if isinstance(response, GrvtError):
             msg = str(getattr(response, "message", "") or "").lower()
             # Already gone/closed orders are effectively cancelled for cleanup.
-            if any(k in msg for k in ["not found", "does not exist", "already closed", "already canceled", "already cancelled"]):
+            if any(k in msg for k in CANCEL_GONE_MSG_TOKENS):
                 return True
             logging.warning(
                 "Cancel order failed account=%s order_id=%s code=%s status=%s msg=%s",
@@ -589,15 +741,22 @@ class DualMakerHedgeEngine:
         order_id = str(getattr(order, "order_id", "") or "")
         return self._cancel_order_by_id(runtime, order_id)
 
+    def _order_client_id(self, order: Order) -> str:
+        metadata = getattr(order, "metadata", None)
+        return str(getattr(metadata, "client_order_id", "") or "")
+
     def _order_create_ns(self, order: Order) -> int:
         metadata = getattr(order, "metadata", None)
         value = str(getattr(metadata, "create_time", "") or "").strip()
         if not value:
             return 0
+        # Exchange returns unix nanoseconds; ISO strings only come from locally built orders.
+        if value.isdecimal():
+            return int(value)
         if value.endswith("Z") or "T" in value:
             try:
                 dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
-                return int(dt.timestamp() * 1_000_000_000)
+                return int(dt.timestamp() * NS_PER_SEC)
             except Exception:
                 return 0
         try:
@@ -607,7 +766,7 @@ class DualMakerHedgeEngine:
 
     def _is_placeholder_order_id(self, order_id: str) -> bool:
         oid = str(order_id or "").strip().lower()
-        return oid in {"", "0", "0x0", "0x00"} or oid.startswith("0x00")
+        return oid in PLACEHOLDER_ORDER_IDS or oid.startswith("0x00")
 
     def _cleanup_strategy_orders_on_stop(self) -> None:
         if not self.cancel_on_stop:
@@ -619,18 +778,17 @@ class DualMakerHedgeEngine:
         for label, runtime in self.accounts.items():
             grouped = self._query_open_orders(runtime)
             for symbol, orders in grouped.items():
-                strategy_orders: List[Order] = []
-                for order in orders:
-                    metadata = getattr(order, "metadata", None)
-                    client_order_id = str(getattr(metadata, "client_order_id", "") or "")
-                    if self._is_strategy_order(client_order_id):
-                        strategy_orders.append(order)
-                if not strategy_orders:
+                decorated = [
+                    (self._order_create_ns(order), order)
+                    for order in orders
+                    if self._is_strategy_order(self._order_client_id(order))
+                ]
+                if not decorated:
                     continue
-                strategy_orders.sort(key=self._order_create_ns, reverse=True)
-                to_cancel = strategy_orders[keep_n:] if keep_n > 0 else strategy_orders
+                decorated.sort(key=lambda item: item[0], reverse=True)
+                to_cancel = decorated[keep_n:] if keep_n > 0 else decorated
                 total_candidates += len(to_cancel)
-                for order in to_cancel:
+                for _, order in to_cancel:
                     if self._cancel_order(runtime, order):
                         total_cancelled += 1
                         logging.info(
@@ -647,21 +805,18 @@ class DualMakerHedgeEngine:
         )
 
     def _query_account_summary(self, runtime: AccountRuntime) -> Optional[Dict[str, Decimal]]:
-        response = runtime.client.aggregated_account_summary_v1(EmptyRequest())
-        if isinstance(response, GrvtError) and self._is_auth_error(response):
-            runtime.client = self._build_client(runtime.config)
-            response = runtime.client.aggregated_account_summary_v1(EmptyRequest())
+        response = self._call_with_auth_retry(runtime, "aggregated_account_summary_v1", EMPTY_REQUEST)
         if isinstance(response, GrvtError):
-            self._notify(
+            self._notify_lazy(
                 title=f"GRVT hedge account summary failed {runtime.config.name}",
-                message=f"code={response.code} status={response.status} msg={response.message}",
                 alert_key=f"summary:{runtime.config.name}",
                 cooldown_sec=120,
+                msg_factory=lambda: f"code={response.code} status={response.status} msg={response.message}",
             )
             return None
-        total_equity = self._to_decimal(getattr(response.result, "total_equity", "0"), Decimal("0"))
-        maintenance_margin = self._to_decimal(getattr(response.result, "maintenance_margin", "0"), Decimal("0"))
-        available_balance = self._to_decimal(getattr(response.result, "available_balance", "0"), Decimal("0"))
+        total_equity = self._to_decimal(getattr(response.result, "total_equity", "0"), DEC_ZERO)
+        maintenance_margin = self._to_decimal(getattr(response.result, "maintenance_margin", "0"), DEC_ZERO)
+        available_balance = self._to_decimal(getattr(response.result, "available_balance", "0"), DEC_ZERO)
         return {
             "equity": total_equity,
             "maintenance_margin": maintenance_margin,
@@ -669,116 +824,114 @@ class DualMakerHedgeEngine:
         }
 
     def _fetch_book_top(self, runtime: AccountRuntime, instrument: str) -> Optional[Dict[str, Decimal]]:
-        response = runtime.client.orderbook_levels_v1(
-            ApiOrderbookLevelsRequest(instrument=instrument, depth=self.orderbook_depth)
-        )
-        if isinstance(response, GrvtError) and self._is_auth_error(response):
-            runtime.client = self._build_client(runtime.config)
-            response = runtime.client.orderbook_levels_v1(
-                ApiOrderbookLevelsRequest(instrument=instrument, depth=self.orderbook_depth)
-            )
+        request = self._book_requests.get(instrument)
+        if request is None:
+            request = ApiOrderbookLevelsRequest(instrument=instrument, depth=self.orderbook_depth)
+            self._book_requests[instrument] = request
+        response = self._call_with_auth_retry(runtime, "orderbook_levels_v1", request)
         if isinstance(response, GrvtError):
-            self._notify(
+            self._notify_lazy(
                 title=f"GRVT hedge orderbook failed {instrument}",
-                message=f"account={runtime.config.name} code={response.code} status={response.status} msg={response.message}",
                 alert_key=f"book:{runtime.config.name}:{instrument}",
                 cooldown_sec=60,
+                msg_factory=lambda: (
+                    f"account={runtime.config.name} code={response.code} status={response.status} msg={response.message}"
+                ),
             )
             return None
         if not response.result.bids or not response.result.asks:
             return None
-        bid1 = self._to_decimal(response.result.bids[0].price, Decimal("0"))
-        ask1 = self._to_decimal(response.result.asks[0].price, Decimal("0"))
+        bid1 = self._to_decimal(response.result.bids[0].price, DEC_ZERO)
+        ask1 = self._to_decimal(response.result.asks[0].price, DEC_ZERO)
         if bid1 <= 0 or ask1 <= 0:
             return None
         return {"bid1": bid1, "ask1": ask1}
 
     def _is_strategy_order(self, client_order_id: str) -> bool:
-        if client_order_id.startswith(f"{ORDER_PREFIX}_"):
-            return True
-        try:
-            value = int(client_order_id)
-            return (value & ORDER_ID_MASK) == ORDER_ID_PREFIX
-        except (TypeError, ValueError):
-            return False
+        return _is_strategy_client_id(client_order_id)
 
     def _parse_order_side(self, order: Order) -> str:
         if not order.legs:
             return "buy"
         return "buy" if bool(order.legs[0].is_buying_asset) else "sell"
 
-    def _order_status_name(self, order: Order) -> str:
-        status = getattr(getattr(order, "state", None), "status", None)
+    # The order accessors below take Order.state (an SDK dataclass, or None for
+    # locally built orders) so callers read it once per order.
+    def _order_status_name(self, order_state: Optional[OrderState]) -> str:
+        status = order_state.status if order_state is not None else None
         if status is None:
             return "OPEN"
         if isinstance(status, OrderStatus):
             return status.name
         return str(status)
 
-    def _order_traded_size(self, order: Order) -> Decimal:
-        state = getattr(order, "state", None)
-        if not state:
-            return Decimal("0")
-        traded = getattr(state, "traded_size", None) or []
-        if not traded:
-            return Decimal("0")
-        return self._to_decimal(traded[0], Decimal("0"))
-
-    def _order_avg_fill_price(self, order: Order) -> Decimal:
-        state = getattr(order, "state", None)
-        if state:
-            avg_fill = getattr(state, "avg_fill_price", None) or []
-            if avg_fill:
-                value = self._to_decimal(avg_fill[0], Decimal("0"))
-                if value > 0:
-                    return value
-        if getattr(order, "legs", None):
-            return self._to_decimal(getattr(order.legs[0], "limit_price", "0"), Decimal("0"))
-        return Decimal("0")
-
-    def _order_book_size(self, order: Order) -> Decimal:
-        state = getattr(order, "state", None)
-        if not state:
-            return Decimal("0")
-        book_size = getattr(state, "book_size", None) or []
-        if not book_size:
-            return Decimal("0")
-        return self._to_decimal(book_size[0], Decimal("0"))
+    def _order_traded_size(self, order_state: Optional[OrderState]) -> Decimal:
+        if order_state is None or not order_state.traded_size:
+            return DEC_ZERO
+        return self._to_decimal(order_state.traded_size[0], DEC_ZERO)
+
+    def _order_avg_fill_price(self, order: Order, order_state: Optional[OrderState]) -> Decimal:
+        if order_state is not None and order_state.avg_fill_price:
+            value = self._to_decimal(order_state.avg_fill_price[0], DEC_ZERO)
+            if value > 0:
+                return value
+        if order.legs:
+            return self._to_decimal(order.legs[0].limit_price, DEC_ZERO)
+        return DEC_ZERO
+
+    def _order_book_size(self, order_state: Optional[OrderState]) -> Decimal:
+        if order_state is None or not order_state.book_size:
+            return DEC_ZERO
+        return self._to_decimal(order_state.book_size[0], DEC_ZERO)
 
     def _to_order_notional(self, size: Decimal, price: Decimal) -> Decimal:
-        return (size * price).quantize(Decimal("0.000001"), rounding=ROUND_DOWN)
+        return (size * price).quantize(DEC_MICRO, rounding=ROUND_DOWN)
 
     def _quantize_price(self, price: Decimal, tick: Decimal, side: str) -> Decimal:
         if tick <= 0:
             return price
-        units = price / tick
-        if side == "sell":
-            units = units.to_integral_value(rounding=ROUND_CEILING)
-        else:
-            units = units.to_integral_value(rounding=ROUND_DOWN)
-        return (units * tick).quantize(tick)
-
-    def _size_from_notional(self, notional: Decimal, price: Decimal, instrument: Any) -> Decimal:
-        if price <= 0 or notional <= 0:
-            return Decimal("0")
-        base_decimals = int(getattr(instrument, "base_decimals", 6))
-        min_size = self._to_decimal(getattr(instrument, "min_size", "0"), Decimal("0"))
-        quantum = Decimal(1).scaleb(-base_decimals)
+        # Work in whole ticks: // is exact integer division (truncating toward zero).
+        units = int(price // tick)
+        if side == "sell" and tick * units < price:
+            units += 1
+        return (tick * units).quantize(tick)
+
+    def _load_instrument_meta(self, state: SymbolState, runtime: AccountRuntime) -> bool:
+        if state.instrument_info is not None:
+            return True
+        instrument_info = self._fetch_instrument(runtime, state.config.instrument)
+        if not instrument_info:
+            return False
+        base_decimals = int(getattr(instrument_info, "base_decimals", 6))
+        min_size = self._to_decimal(getattr(instrument_info, "min_size", "0"), DEC_ZERO)
+        quantum = _decimal_quantum(base_decimals)
         step = min_size if min_size > 0 else quantum
         if step < quantum:
             step = quantum
-        raw_size = notional / price
-        size = (raw_size / step).to_integral_value(rounding=ROUND_DOWN) * step
-        size = size.quantize(quantum, rounding=ROUND_DOWN)
-        if size < min_size:
-            size = min_size
+        state.tick = self._to_decimal(getattr(instrument_info, "tick_size", "0.1"), DEC_DEFAULT_TICK)
+        state.size_step = step
+        state.size_quantum = quantum
+        state.min_size = min_size
+        state.instrument_info = instrument_info
+        self._sign_instruments[state.config.instrument] = instrument_info
+        return True
+
+    def _size_from_notional(self, notional: Decimal, price: Decimal, state: SymbolState) -> Decimal:
+        if price <= 0 or notional <= 0:
+            return DEC_ZERO
+        step = state.size_step
+        # Whole lots of `step` that fit in the notional; one exact integer division.
+        lots = int(notional // (price * step))
+        size = (step * lots).quantize(state.size_quantum, rounding=ROUND_DOWN)
+        if size < state.min_size:
+            size = state.min_size
         return size
 
     def _mmr_check(self, runtime: AccountRuntime, summary: Optional[Dict[str, Decimal]]) -> None:
         if not summary:
             return
-        equity = summary.get("equity", Decimal("0"))
-        maintenance = summary.get("maintenance_margin", Decimal("0"))
+        equity = summary.get("equity", DEC_ZERO)
+        maintenance = summary.get("maintenance_margin", DEC_ZERO)
         if equity <= 0:
             return
         ratio = maintenance / equity
@@ -790,21 +943,27 @@ class DualMakerHedgeEngine:
                 cooldown_sec=1800,
             )
 
+    def _register_managed_order(self, state: SymbolState, managed: ManagedOrder) -> None:
+        state.managed_orders[managed.order_id] = managed
+        if managed.client_order_id:
+            state.by_client_id[managed.client_order_id] = managed.order_id
+        state.active_orders = None
+
     def _sync_state_orders(
         self,
         state: SymbolState,
         account_label: str,
         live_orders: List[Order],
     ) -> None:
-        now = time.time()
+        now = time.monotonic_ns()
+        state.active_orders = None
         live_ids = set()
         for order in live_orders:
-            order_id = str(getattr(order, "order_id", "") or "")
+            order_id = str(order.order_id or "")
             if not order_id:
                 continue
             live_ids.add(order_id)
-            metadata = getattr(order, "metadata", None)
-            client_order_id = str(getattr(metadata, "client_order_id", "") or "")
+            client_order_id = self._order_client_id(order)
             strategy_owned = self._is_strategy_order(client_order_id)
             if not strategy_owned:
                 if not state.non_strategy_alerted:
@@ -817,23 +976,24 @@ class DualMakerHedgeEngine:
                     )
                 continue
             side = self._parse_order_side(order)
-            price = self._to_decimal(getattr(order.legs[0], "limit_price", "0"), Decimal("0"))
-            size = self._to_decimal(getattr(order.legs[0], "size", "0"), Decimal("0"))
+            leg = order.legs[0]
+            price = self._to_decimal(leg.limit_price, DEC_ZERO)
+            size = self._to_decimal(leg.size, DEC_ZERO)
             managed = state.managed_orders.get(order_id)
             if managed is None and client_order_id:
                 # Reconcile provisional local order_id (e.g. 0x00) with real exchange order_id.
-                for old_key, old_managed in list(state.managed_orders.items()):
-                    if old_managed.account_label != account_label:
-                        continue
-                    if old_managed.client_order_id != client_order_id:
-                        continue
-                    if not self._is_placeholder_order_id(old_managed.order_id):
-                        continue
+                old_key = state.by_client_id.get(client_order_id)
+                old_managed = state.managed_orders.get(old_key) if old_key is not None else None
+                if (
+                    old_managed is not None
+                    and old_managed.account_label == account_label
+                    and old_managed.client_order_id == client_order_id
+                    and self._is_placeholder_order_id(old_managed.order_id)
+                ):
                     old_managed.order_id = order_id
-                    state.managed_orders[order_id] = old_managed
                     del state.managed_orders[old_key]
+                    self._register_managed_order(state, old_managed)
                     managed = old_managed
-                    break
             if managed is None:
                 managed = ManagedOrder(
                     order_id=order_id,
@@ -847,7 +1007,7 @@ class DualMakerHedgeEngine:
                     created_at=now,
                     strategy_owned=strategy_owned,
                 )
-                state.managed_orders[order_id] = managed
+                self._register_managed_order(state, managed)
             managed.last_seen_at = now
             managed.closed = False
             managed.side = side
@@ -855,6 +1015,7 @@ class DualMakerHedgeEngine:
             managed.size = size
             managed.notional_usdt = self._to_order_notional(size, price)
             self._process_order_fill_delta(state, managed, order)
+        missing: List[Any] = []
         for order_id, managed in list(state.managed_orders.items()):
             if managed.account_label != account_label:
                 continue
@@ -862,45 +1023,65 @@ class DualMakerHedgeEngine:
                 continue
             if self._is_placeholder_order_id(order_id):
                 # If still provisional and not observed in snapshots for long enough, mark closed.
-                if now - managed.created_at > 60:
+                if now - managed.created_at > PROVISIONAL_ORDER_TIMEOUT_NS:
                     managed.closed = True
                     managed.close_reason = "PROVISIONAL_TIMEOUT"
                 continue
             if order_id in live_ids:
                 continue
-            runtime = self.accounts[account_label]
-            response = runtime.client.get_order_v1(
-                ApiGetOrderRequest(sub_account_id=runtime.config.account_id, order_id=order_id)
+            missing.append((order_id, managed))
+        if not missing:
+            return
+        runtime = self.accounts[account_label]
+        history: Dict[str, Order] = {}
+        if len(missing) > 1:
+            # One history page usually covers every order that just left the open book.
+            instrument_info = state.instrument_info
+            response = self._call_with_auth_retry(
+                runtime,
+                "order_history_v1",
+                ApiOrderHistoryRequest(
+                    sub_account_id=runtime.config.account_id,
+                    kind=PERPETUAL_KINDS,
+                    base=[instrument_info.base] if instrument_info is not None else None,
+                    limit=ORDER_HISTORY_PROBE_LIMIT,
+                ),
             )
-            if isinstance(response, GrvtError) and self._is_auth_error(response):
-                runtime.client = self._build_client(runtime.config)
-                response = runtime.client.get_order_v1(
-                    ApiGetOrderRequest(sub_account_id=runtime.config.account_id, order_id=order_id)
+            if not isinstance(response, GrvtError):
+                history = {str(order.order_id): order for order in response.result}
+        for order_id, managed in missing:
+            order = history.get(order_id)
+            if order is None:
+                response = self._call_with_auth_retry(
+                    runtime,
+                    "get_order_v1",
+                    ApiGetOrderRequest(sub_account_id=runtime.config.account_id, order_id=order_id),
                 )
-            if isinstance(response, GrvtError):
-                continue
-            order = response.result
+                if isinstance(response, GrvtError):
+                    continue
+                order = response.result
             self._process_order_fill_delta(state, managed, order)
-            status_name = self._order_status_name(order)
-            if status_name in {"FILLED", "CANCELLED", "REJECTED"}:
+            status_name = self._order_status_name(order.state)
+            if status_name in TERMINAL_ORDER_STATUSES:
                 managed.closed = True
                 managed.close_reason = status_name
 
     def _process_order_fill_delta(self, state: SymbolState, managed: ManagedOrder, order: Order) -> None:
-        traded = self._order_traded_size(order)
+        order_state = order.state
+        traded = self._order_traded_size(order_state)
         if traded <= managed.applied_traded_size:
             return
-        status_name = self._order_status_name(order)
-        book_size = self._order_book_size(order)
+        status_name = self._order_status_name(order_state)
+        book_size = self._order_book_size(order_state)
         is_partial_open = status_name == "OPEN" and book_size > 0 and traded < managed.size
-        now = time.time()
+        now = time.monotonic_ns()
         if is_partial_open:
             if managed.partial_since is None:
                 managed.partial_since = now
-            if now - managed.partial_since < self.partial_fill_timeout_sec:
+            if now - managed.partial_since < self.partial_fill_timeout_ns:
                 return
         delta_size = traded - managed.applied_traded_size
-        fill_price = self._order_avg_fill_price(order)
+        fill_price = self._order_avg_fill_price(order, order_state)
         if delta_size > 0 and fill_price > 0:
             fill_notional = self._to_order_notional(delta_size, fill_price)
             self._apply_fill_to_lots(
@@ -911,7 +1092,7 @@ class DualMakerHedgeEngine:
                 fill_notional=fill_notional,
             )
         managed.applied_traded_size = traded
-        if status_name in {"FILLED", "CANCELLED", "REJECTED"}:
+        if status_name in TERMINAL_ORDER_STATUSES:
             managed.closed = True
             managed.close_reason = status_name
 
@@ -925,31 +1106,31 @@ class DualMakerHedgeEngine:
     ) -> None:
         remaining = fill_notional
         opposite = "sell" if source_side == "buy" else "buy"
-        new_queue: Deque[FillLot] = deque()
-        while state.lots and remaining > 0:
-            lot = state.lots.popleft()
-            if lot.remaining_notional <= 0:
-                continue
-            is_candidate = lot.source_account != source_account and lot.source_side == opposite
-            price_ok = True
-            if is_candidate:
-                if source_side == "sell":
-                    price_ok = fill_price >= lot.price
-                else:
-                    price_ok = fill_price <= lot.price
-            if not is_candidate or not price_ok:
-                new_queue.append(lot)
-                continue
-            matched = min(remaining, lot.remaining_notional)
-            lot.remaining_notional -= matched
-            remaining -= matched
-            if lot.remaining_notional > 0:
-                new_queue.append(lot)
-        while state.lots:
-            new_queue.append(state.lots.popleft())
-        state.lots = new_queue
+        is_sell = source_side == "sell"
+        if remaining > 0:
+            for lot in state.lots:
+                lot_remaining = lot.remaining_notional
+                if lot_remaining <= 0:
+                    continue
+                if lot.source_account == source_account or lot.source_side != opposite:
+                    continue
+                if is_sell:
+                    if fill_price < lot.price:
+                        continue
+                elif fill_price > lot.price:
+                    continue
+                matched = min(remaining, lot_remaining)
+                lot.remaining_notional = lot_remaining - matched
+                remaining -= matched
+                if lot.remaining_notional <= 0:
+                    state.spent_lots += 1
+                if remaining <= 0:
+                    break
+        if state.spent_lots >= LOT_COMPACT_THRESHOLD:
+            self._compact_lots(state)
         if remaining > 0:
-            state.lots.append(
+            self._append_lot(
+                state,
                 FillLot(
                     source_account=source_account,
                     source_side=source_side,
@@ -957,16 +1138,61 @@ class DualMakerHedgeEngine:
                     remaining_notional=remaining,
                     created_at=time.time(),
                     synthetic=False,
-                )
+                ),
             )
 
+    def _compact_lots(self, state: SymbolState) -> Deque[FillLot]:
+        lots = deque((item for item in state.lots if item.remaining_notional > 0), maxlen=state.lots.maxlen)
+        state.lots = lots
+        state.spent_lots = 0
+        return lots
+
+    def _append_lot(self, state: SymbolState, lot: FillLot) -> None:
+        lots = state.lots
+        if lots.maxlen is not None and len(lots) >= lots.maxlen:
+            # Drop fully matched lots first; only merge when live lots fill the cap.
+            lots = self._compact_lots(state)
+            if len(lots) >= lots.maxlen and self._merge_lots_on_evict(lots, lot):
+                return
+        lots.append(lot)
+
+    def _merge_lots_on_evict(self, lots: Deque[FillLot], incoming: FillLot) -> bool:
+        # Fold the first repeated (account, side) lot into its oldest peer so the capped
+        # queue keeps aggregate notional instead of letting deque silently drop the head.
+        # Returns True when the incoming lot itself was absorbed.
+        first_seen: Dict[Any, FillLot] = {}
+        for idx, lot in enumerate(lots):
+            key = (lot.source_account, lot.source_side)
+            head = first_seen.get(key)
+            if head is None:
+                first_seen[key] = lot
+                continue
+            self._fold_lot(head, lot)
+            del lots[idx]
+            return False
+        head = first_seen.get((incoming.source_account, incoming.source_side))
+        if head is None:
+            return False
+        self._fold_lot(head, incoming)
+        return True
+
+    def _fold_lot(self, target: FillLot, other: FillLot) -> None:
+        total = target.remaining_notional + other.remaining_notional
+        if total > 0:
+            target.price = (
+                target.price * target.remaining_notional + other.price * other.remaining_notional
+            ) / total
+        target.remaining_notional = total
+        target.synthetic = True
+
     def _bootstrap_symbol_state(self, state: SymbolState, snapshots: Dict[str, Dict[str, Any]]) -> None:
         instrument = state.config.instrument
         for label in ("A", "B"):
-            pos = snapshots[label]["positions"].get(instrument, PositionSnapshot())
+            pos = snapshots[label]["positions"].get(instrument, EMPTY_POSITION)
             if pos.abs_notional > 0 and pos.entry_price > 0:
                 side = "buy" if pos.size > 0 else "sell"
-                state.lots.append(
+                self._append_lot(
+                    state,
                     FillLot(
                         source_account=label,
                         source_side=side,
@@ -974,37 +1200,44 @@ class DualMakerHedgeEngine:
                         remaining_notional=pos.abs_notional,
                         created_at=time.time(),
                         synthetic=True,
-                    )
+                    ),
                 )
             self._sync_state_orders(state, label, snapshots[label]["open_orders"].get(instrument, []))
 
-    def _build_client_order_id(self, symbol: str, account_label: str, side: str) -> str:
+    def _build_client_order_id(self, symbol: str, account_label: str, side: str, entropy: int) -> str:
         # GRVT expects numeric client_order_id. Use a dedicated high-bit namespace to
         # identify strategy-owned orders while keeping account/side bits for debugging.
-        acc_bit = 0 if account_label == "A" else 1
-        side_bit = 0 if side == "buy" else 1
-        entropy = (time.time_ns() ^ random.getrandbits(32)) & ((1 << 58) - 1)
-        value = ORDER_ID_PREFIX | (acc_bit << 59) | (side_bit << 58) | entropy
-        return str(value)
+        return str(ORDER_ID_BASE[(account_label, side)] | (entropy & ORDER_ID_ENTROPY_MASK))
+
+    def _format_create_time(self, now_ns: int) -> str:
+        secs, nanos = divmod(now_ns, NS_PER_SEC)
+        if secs != self._create_time_sec:
+            self._create_time_prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(secs))
+            self._create_time_sec = secs
+        return f"{self._create_time_prefix}.{nanos // 1000:06d}Z"
 
     def _create_signed_order(
         self,
         runtime: AccountRuntime,
-        instrument_info: Any,
-        symbol: str,
+        state: SymbolState,
         side: str,
         price: Decimal,
         notional: Decimal,
     ) -> Optional[ManagedOrder]:
-        size = self._size_from_notional(notional, price, instrument_info)
+        symbol = state.config.instrument
+        size = self._size_from_notional(notional, price, state)
         if size <= 0:
             return None
         adjusted_notional = self._to_order_notional(size, price)
         if adjusted_notional <= 0:
             return None
-        client_order_id = self._build_client_order_id(symbol, runtime.label, side)
-        expiration_ns = str(int(time.time_ns() + 15 * 60 * 1_000_000_000))
-        nonce = random.randint(1, 2**31 - 1)
+        now_ns = time.time_ns()
+        rand = os.urandom(12)
+        client_order_id = self._build_client_order_id(
+            symbol, runtime.label, side, now_ns ^ int.from_bytes(rand[4:], "big")
+        )
+        expiration_ns = str(now_ns + 15 * 60 * NS_PER_SEC)
+        nonce = (int.from_bytes(rand[:4], "big") & 0x7FFFFFFF) or 1
         order = Order(
             sub_account_id=runtime.config.account_id,
             time_in_force=TimeInForce.GOOD_TILL_TIME,
@@ -1019,24 +1252,25 @@ class DualMakerHedgeEngine:
             signature=Signature(signer="", r="0x", s="0x", v=0, expiration=expiration_ns, nonce=nonce),
             metadata=OrderMetadata(
                 client_order_id=client_order_id,
-                create_time=datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+                create_time=self._format_create_time(now_ns),
             ),
             is_market=False,
             post_only=True,
             reduce_only=False,
         )
         try:
-            signed_order = sign_order(order, runtime.client.config, runtime.signer, {symbol: instrument_info})
+            signed_order = sign_order(order, runtime.client.config, runtime.signer, self._sign_instruments)
         except Exception as exc:
             raise RuntimeError(f"sign_order_failed: {exc}") from exc
-        response = runtime.client.create_order_v1(ApiCreateOrderRequest(order=signed_order))
-        if isinstance(response, GrvtError) and self._is_auth_error(response):
-            runtime.client = self._build_client(runtime.config)
+        # sign_order fills order.signature in place, so the request stays valid after re-signing.
+        create_req = ApiCreateOrderRequest(order=signed_order)
+        response = runtime.client.create_order_v1(create_req)
+        if isinstance(response, GrvtError) and self._is_auth_error(response) and self._rebuild_client(runtime):
             try:
-                signed_order = sign_order(order, runtime.client.config, runtime.signer, {symbol: instrument_info})
+                sign_order(order, runtime.client.config, runtime.signer, self._sign_instruments)
             except Exception as exc:
                 raise RuntimeError(f"sign_order_failed_after_reauth: {exc}") from exc
-            response = runtime.client.create_order_v1(ApiCreateOrderRequest(order=signed_order))
+            response = runtime.client.create_order_v1(create_req)
         if isinstance(response, GrvtError):
             raise RuntimeError(
                 f"create_order_failed code={response.code} status={response.status} message={response.message}"
@@ -1054,7 +1288,7 @@ class DualMakerHedgeEngine:
             price=price,
             size=size,
             notional_usdt=adjusted_notional,
-            created_at=time.time(),
+            created_at=time.monotonic_ns(),
             strategy_owned=True,
         )
 
@@ -1067,10 +1301,9 @@ class DualMakerHedgeEngine:
         notional: Decimal,
     ) -> bool:
         symbol = state.config.instrument
-        instrument_info = self._fetch_instrument(runtime, symbol)
-        if not instrument_info:
+        if not self._load_instrument_meta(state, runtime):
             return False
-        tick = self._to_decimal(getattr(instrument_info, "tick_size", "0.1"), Decimal("0.1"))
+        tick = state.tick
         for attempt in range(1, self.post_only_max_retry + 1):
             book = self._fetch_book_top(runtime, symbol)
             if not book:
@@ -1086,9 +1319,9 @@ class DualMakerHedgeEngine:
             if price <= 0:
                 continue
             try:
-                managed = self._create_signed_order(runtime, instrument_info, symbol, side, price, notional)
+                managed = self._create_signed_order(runtime, state, side, price, notional)
                 if managed:
-                    state.managed_orders[managed.order_id] = managed
+                    self._register_managed_order(state, managed)
                     logging.info(
                         "[%s] Placed %s %s %.4f USDT @ %s",
                         symbol,
@@ -1099,8 +1332,7 @@ class DualMakerHedgeEngine:
                     )
                     return True
             except RuntimeError as exc:
-                msg = str(exc).lower()
-                if any(k in msg for k in ["post", "maker", "would match", "taker"]):
+                if POST_ONLY_REJECT_RE.search(str(exc)):
                     logging.debug("[%s] post-only reject on attempt %d/%d", symbol, attempt, self.post_only_max_retry)
                     time.sleep(0.2)
                     continue
@@ -1111,7 +1343,7 @@ class DualMakerHedgeEngine:
                     cooldown_sec=120,
                 )
                 return False
-        state.cooldown_until = time.time() + self.post_only_cooldown_sec
+        state.cooldown_until = time.monotonic_ns() + self.post_only_cooldown_ns
         self._notify(
             title=f"GRVT hedge cooldown {symbol}",
             message=f"post-only failed after {self.post_only_max_retry} retries, cooldown {self.post_only_cooldown_sec}s",
@@ -1121,22 +1353,34 @@ class DualMakerHedgeEngine:
         return False
 
     def _active_order_count(self, state: SymbolState, account_label: str) -> int:
-        return sum(1 for m in self._active_strategy_orders(state) if m.account_label == account_label)
+        if state.active_orders is None:
+            self._active_strategy_orders(state)
+        return state.active_counts[account_label]
 
     def _active_strategy_orders(self, state: SymbolState) -> List[ManagedOrder]:
-        now = time.time()
+        if state.active_orders is not None:
+            return state.active_orders
+        now = time.monotonic_ns()
         result: List[ManagedOrder] = []
+        counts: Counter[str] = Counter()
+        open_notional: Dict[Tuple[str, str], Decimal] = {}
         for managed in state.managed_orders.values():
             if not managed.strategy_owned:
                 continue
             if managed.closed:
                 continue
-            if managed.last_seen_at > 0 and now - managed.last_seen_at > 3600:
+            key = (managed.account_label, managed.side)
+            open_notional[key] = open_notional.get(key, DEC_ZERO) + managed.notional_usdt
+            if managed.last_seen_at > 0 and now - managed.last_seen_at > STALE_ORDER_NS:
                 continue
             # Newly placed orders may not be in open_orders snapshot yet; still count them.
-            if managed.last_seen_at <= 0 and now - managed.created_at > 600:
+            if managed.last_seen_at <= 0 and now - managed.created_at > UNSEEN_ORDER_NS:
                 continue
             result.append(managed)
+            counts[managed.account_label] += 1
+        state.active_orders = result
+        state.active_counts = counts
+        state.open_notional = open_notional
         return result
 
     def _cancel_managed_order(self, state: SymbolState, managed: ManagedOrder, reason: str) -> bool:
@@ -1147,6 +1391,7 @@ class DualMakerHedgeEngine:
         if ok:
             managed.closed = True
             managed.close_reason = reason
+            state.active_orders = None
         return ok
 
     def _enforce_account_order_cap(self, state: SymbolState, account_label: str, max_orders: int) -> None:
@@ -1155,7 +1400,7 @@ class DualMakerHedgeEngine:
             return
         overflow_count = len(active_orders) - max_orders
         # Cancel oldest strategy orders first to keep the most recent intention.
-        to_cancel = sorted(active_orders, key=lambda x: x.created_at)[:overflow_count]
+        to_cancel = heapq.nsmallest(overflow_count, active_orders, key=CREATED_AT_KEY)
         for managed in to_cancel:
             ok = self._cancel_managed_order(state, managed, reason="low_diff_account_order_cap")
             if ok:
@@ -1174,22 +1419,9 @@ class DualMakerHedgeEngine:
                 )
 
     def _active_hedge_notional(self, state: SymbolState, account_label: str, side: str) -> Decimal:
-        total = Decimal("0")
-        for managed in state.managed_orders.values():
-            if managed.account_label != account_label:
-                continue
-            if not managed.strategy_owned:
-                continue
-            if managed.closed:
-                continue
-            if managed.side != side:
-                continue
-            total += managed.notional_usdt
-        return total
-
-    def _project_abs_notional(self, signed_notional: Decimal, side: str, order_notional: Decimal) -> Decimal:
-        delta = order_notional if side == "buy" else -order_notional
-        return abs(signed_notional + delta)
+        if state.active_orders is None:
+            self._active_strategy_orders(state)
+        return state.open_notional.get((account_label, side), DEC_ZERO)
 
     def _clip_order_notional_to_total_bound(
         self,
@@ -1200,25 +1432,40 @@ class DualMakerHedgeEngine:
         mode: str,
         bound_total: Decimal,
     ) -> Decimal:
+        # Projected total is other_abs + |t + c| with t the position signed along the
+        # order side, so the feasible candidates form at most two intervals. Return the
+        # largest candidate on the N/50 grid that satisfies the bound.
         if order_notional <= 0:
-            return Decimal("0")
-        candidate = order_notional
-        steps = 50
-        step = order_notional / Decimal(steps)
-        if step <= 0:
-            step = order_notional
-        for _ in range(steps + 1):
-            projected_total = other_abs + self._project_abs_notional(signed_notional, side, candidate)
-            if mode == "increase":
-                if projected_total <= bound_total:
-                    return candidate
-            else:
-                if projected_total >= bound_total:
-                    return candidate
-            candidate -= step
-            if candidate <= 0:
-                return Decimal("0")
-        return Decimal("0")
+            return DEC_ZERO
+        t = signed_notional if side == "buy" else -signed_notional
+        room = bound_total - other_abs
+        if mode == "increase":
+            if room < 0:
+                return DEC_ZERO
+            candidate = self._largest_clip_step(order_notional, room - t)
+            if candidate < -room - t:
+                return DEC_ZERO
+            return candidate
+        if room <= 0 or order_notional >= room - t:
+            return order_notional
+        return self._largest_clip_step(order_notional, -room - t)
+
+    def _largest_clip_step(self, order_notional: Decimal, limit: Decimal) -> Decimal:
+        # Largest of order_notional * j / CLIP_STEPS (j >= 1) not above limit, else 0.
+        if limit >= order_notional:
+            return order_notional
+        if limit <= 0:
+            return DEC_ZERO
+        step = order_notional / CLIP_STEPS
+        units = int(limit / step)
+        # Division rounding can land one unit off the true floor.
+        if units < CLIP_STEPS and step * (units + 1) <= limit:
+            units += 1
+        elif units > 0 and step * units > limit:
+            units -= 1
+        if units <= 0:
+            return DEC_ZERO
+        return step * units
 
     def _required_hedge_side_guard(
         self,
@@ -1280,39 +1527,48 @@ class DualMakerHedgeEngine:
 
     def _bootstrap(self) -> None:
         snapshots = self._collect_snapshots()
-        for state in self.symbol_states.values():
+        for state in self._symbol_states_tuple:
             if not state.config.enabled:
                 continue
+            self._load_instrument_meta(state, self.accounts["A"])
             self._bootstrap_symbol_state(state, snapshots)
         logging.info("Bootstrap completed for %d symbols", len(self.symbol_states))
 
+    def _collect_account_snapshot(self, runtime: AccountRuntime) -> Dict[str, Any]:
+        self._ensure_client(runtime)
+        return {
+            "positions": self._query_positions(runtime),
+            "open_orders": self._query_open_orders(runtime),
+            "summary": self._query_account_summary(runtime),
+        }
+
     def _collect_snapshots(self) -> Dict[str, Dict[str, Any]]:
+        futures = {
+            label: self._snapshot_pool.submit(self._collect_account_snapshot, runtime)
+            for label, runtime in self.accounts.items()
+        }
+        # Let every worker finish before any result can raise, so no client stays in use
+        # by an abandoned worker while the main thread moves on.
+        wait(futures.values())
         snapshots: Dict[str, Dict[str, Any]] = {}
-        for label, runtime in self.accounts.items():
-            self._ensure_client(runtime)
-            positions = self._query_positions(runtime)
-            open_orders = self._query_open_orders(runtime)
-            summary = self._query_account_summary(runtime)
-            self._mmr_check(runtime, summary)
-            snapshots[label] = {
-                "positions": positions,
-                "open_orders": open_orders,
-                "summary": summary,
-            }
+        for label, future in futures.items():
+            snapshot = future.result()
+            self._mmr_check(self.accounts[label], snapshot["summary"])
+            snapshots[label] = snapshot
         return snapshots
 
     def _process_symbol(self, state: SymbolState, snapshots: Dict[str, Dict[str, Any]]) -> None:
         cfg = state.config
         if not cfg.enabled:
             return
-        now = time.time()
+        now = time.monotonic_ns()
         symbol = cfg.instrument
         if now < state.cooldown_until:
             return
         for label in ("A", "B"):
             self._sync_state_orders(state, label, snapshots[label]["open_orders"].get(symbol, []))
-        pos_a = snapshots["A"]["positions"].get(symbol, PositionSnapshot())
-        pos_b = snapshots["B"]["positions"].get(symbol, PositionSnapshot())
+        pos_a = snapshots["A"]["positions"].get(symbol, EMPTY_POSITION)
+        pos_b = snapshots["B"]["positions"].get(symbol, EMPTY_POSITION)
         abs_a = pos_a.abs_notional
         abs_b = pos_b.abs_notional
         position_diff = abs(abs_a - abs_b)
@@ -1321,21 +1577,24 @@ class DualMakerHedgeEngine:
         self._enforce_account_order_cap(state, "B", per_account_cap)
         self._check_unhedged_alert(state, abs_a, abs_b)
         total_position = abs_a + abs_b
-        increase_limit_reached = cfg.position_mode == "increase" and total_position >= cfg.max_total_position_usdt
-        decrease_limit_reached = cfg.position_mode == "decrease" and total_position <= cfg.min_total_position_usdt
+        mode = cfg.position_mode
+        order_notional_cfg = cfg.order_notional_usdt
+        bound_total = cfg.max_total_position_usdt if mode == "increase" else cfg.min_total_position_usdt
+        increase_limit_reached = mode == "increase" and total_position >= bound_total
+        decrease_limit_reached = mode == "decrease" and total_position <= bound_total
         if increase_limit_reached:
-            self._notify(
+            self._notify_lazy(
                 title=f"GRVT max_total_position exceeded {symbol}",
-                message=f"mode=increase total={total_position} max={cfg.max_total_position_usdt}",
                 alert_key=f"max_total:{symbol}",
                 cooldown_sec=900,
+                msg_factory=lambda: f"mode=increase total={total_position} max={cfg.max_total_position_usdt}",
             )
         if decrease_limit_reached:
-            self._notify(
+            self._notify_lazy(
                 title=f"GRVT min_total_position reached {symbol}",
-                message=f"mode=decrease total={total_position} min={cfg.min_total_position_usdt}",
                 alert_key=f"min_total:{symbol}",
                 cooldown_sec=900,
+                msg_factory=lambda: f"mode=decrease total={total_position} min={cfg.min_total_position_usdt}",
             )
         if abs_a == abs_b:
             # At limits, block expansion-style equal-position re-seeding.
@@ -1352,7 +1611,7 @@ class DualMakerHedgeEngine:
                     runtime=self.accounts["A"],
                     side=side_a,
                     guard_price=None,
-                    notional=cfg.order_notional_usdt,
+                    notional=order_notional_cfg,
                 )
             if self._active_order_count(state, "B") < per_account_cap:
                 self._place_post_only_with_retry(
@@ -1360,10 +1619,13 @@ class DualMakerHedgeEngine:
                     runtime=self.accounts["B"],
                     side=side_b,
                     guard_price=None,
-                    notional=cfg.order_notional_usdt,
+                    notional=order_notional_cfg,
                 )
             return
         small_label = "A" if abs_a < abs_b else "B"
+        # Nothing can be placed once the small side is at its cap; bail before any scan or Decimal math.
+        if self._active_order_count(state, small_label) >= per_account_cap:
+            return
         large_abs = abs_b if small_label == "A" else abs_a
         small_abs = abs_a if small_label == "A" else abs_b
         side_guard = self._required_hedge_side_guard(state, small_label, pos_a, pos_b)
@@ -1371,50 +1633,34 @@ class DualMakerHedgeEngine:
         guard_price = side_guard.get("guard")
         if side is None:
             return
-        active_small_count = self._active_order_count(state, small_label)
         hedge_open = self._active_hedge_notional(state, small_label, side)
-        gap = large_abs - (small_abs + hedge_open / Decimal("2"))
-        if gap <= 0:
-            return
         diff = large_abs - small_abs
-        # Keep filling the small side up to per-account cap before imbalance_limit suppression.
-        if diff <= cfg.imbalance_limit_usdt and hedge_open > 0 and active_small_count >= per_account_cap:
+        # Twice the remaining gap large - (small + hedge_open / 2); working in the doubled
+        # domain drops the Decimal divide and the later re-multiply by 2.
+        gap_x2 = diff + diff - hedge_open
+        if gap_x2 <= 0:
             return
-        # When diff is above low-diff threshold and small side has not reached per-account cap,
+        # When diff is above low-diff threshold (small side is below its cap here),
         # prioritize standard notional to ensure the second order can be established.
-        if diff >= self.single_order_diff_threshold_usdt and active_small_count < per_account_cap:
-            order_notional = cfg.order_notional_usdt
+        if diff >= self.single_order_diff_threshold_usdt:
+            order_notional = order_notional_cfg
         else:
-            order_notional = min(cfg.order_notional_usdt, gap * Decimal("2"))
+            order_notional = min(order_notional_cfg, gap_x2)
         if order_notional <= 0:
             return
-        small_pos = pos_a if small_label == "A" else pos_b
-        signed_small = small_pos.signed_notional
-        old_abs_small = abs(signed_small)
-        other_abs = total_position - old_abs_small
-        if cfg.position_mode == "increase":
-            clipped = self._clip_order_notional_to_total_bound(
-                side=side,
-                order_notional=order_notional,
-                signed_notional=signed_small,
-                other_abs=other_abs,
-                mode="increase",
-                bound_total=cfg.max_total_position_usdt,
-            )
-        else:
-            clipped = self._clip_order_notional_to_total_bound(
-                side=side,
-                order_notional=order_notional,
-                signed_notional=signed_small,
-                other_abs=other_abs,
-                mode="decrease",
-                bound_total=cfg.min_total_position_usdt,
-            )
-        order_notional = clipped
+        signed_small = pos_a.signed_notional if small_label == "A" else pos_b.signed_notional
+        # abs_notional is abs(signed_notional), so total minus the small leg is the large leg.
+        other_abs = large_abs
+        order_notional = self._clip_order_notional_to_total_bound(
+            side=side,
+            order_notional=order_notional,
+            signed_notional=signed_small,
+            other_abs=other_abs,
+            mode=mode,
+            bound_total=bound_total,
+        )
         if order_notional <= 0:
             return
-        if active_small_count >= per_account_cap:
-            return
         self._place_post_only_with_retry(
             state=state,
             runtime=self.accounts[small_label],
@@ -1423,9 +1669,25 @@ class DualMakerHedgeEngine:
             notional=order_notional,
         )
 
+    def _error_backoff_ns(self) -> int:
+        # Back off exponentially across consecutive loop errors, with +/-20% jitter.
+        self._consecutive_errors += 1
+        base_ns = max(self.loop_interval_ns, NS_PER_SEC) << min(self._consecutive_errors, 16)
+        return int(min(base_ns, LOOP_ERROR_BACKOFF_MAX_NS) * random.uniform(0.8, 1.2))
+
+    def _wait_next_tick(self, deadline_ns: int) -> int:
+        # Ticks run on a fixed monotonic grid so loop work does not push later ticks back.
+        sleep_ns = deadline_ns - time.monotonic_ns()
+        if self.loop_interval_ns > 0 and sleep_ns < -self.loop_interval_ns:
+            logging.warning("Loop tick skipped: %.3fs behind schedule", -sleep_ns / NS_PER_SEC)
+            return time.monotonic_ns() + self.loop_interval_ns
+        if sleep_ns > 0:
+            self._stop_event.wait(sleep_ns / NS_PER_SEC)
+        return deadline_ns + self.loop_interval_ns
+
     def run(self) -> None:
         logging.info("GRVT dual maker hedge started")
-        symbol_modes = ",".join([f"{s.config.instrument}:{s.config.position_mode}" for s in self.symbol_states.values()])
+        symbol_modes = ",".join(f"{s.config.instrument}:{s.config.position_mode}" for s in self._symbol_states_tuple)
         logging.info(
             "Symbols=%s, modes=%s, loop=%ss, book_depth=%s, per_account_cap_when_diff<%s=>1, post_only_retry=%s, cooldown=%ss, partial_timeout=%ss, stuck=%sh, mmr=%.2f",
             ",".join(self.symbol_states.keys()),
@@ -1440,16 +1702,18 @@ class DualMakerHedgeEngine:
             float(self.mmr_alert_threshold),
         )
         self._bootstrap()
+        next_tick_ns = time.monotonic_ns() + self.loop_interval_ns
         while not self.stop_flag:
             try:
-                if self.max_runtime_sec > 0 and (time.time() - self.started_at) >= self.max_runtime_sec:
+                if self._run_deadline_ns is not None and time.monotonic_ns() >= self._run_deadline_ns:
                     logging.info("Reached max runtime %ss, stopping hedge engine...", self.max_runtime_sec)
                     self.stop_flag = True
                     continue
                 snapshots = self._collect_snapshots()
-                for state in self.symbol_states.values():
+                for state in self._symbol_states_tuple:
                     self._process_symbol(state, snapshots)
                 self._send_daily_stuck_report()
+                self._consecutive_errors = 0
             except Exception as exc:
                 self._notify(
                     title="GRVT dual hedge loop error",
@@ -1458,11 +1722,13 @@ class DualMakerHedgeEngine:
                     cooldown_sec=120,
                 )
                 logging.exception("Main loop error: %s", exc)
-            time.sleep(self.loop_interval_sec)
+                next_tick_ns = max(next_tick_ns, time.monotonic_ns() + self._error_backoff_ns())
+            next_tick_ns = self._wait_next_tick(next_tick_ns)
         try:
             self._cleanup_strategy_orders_on_stop()
         except Exception as exc:
             logging.exception("Stop cleanup error: %s", exc)
+        self._snapshot_pool.shutdown(wait=False)
         logging.info("GRVT dual maker hedge stopped")
 
 
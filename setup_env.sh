@@ -16,7 +16,7 @@ echo ""
 echo "📋 检查 Python 环境..."
 if ! command -v python3 &> /dev/null; then
     echo "❌ 错误: 未找到 python3"
-    echo "   请先安装 Python 3.8 或更高版本"
+    echo "   请先安装 Python 3.10 或更高版本"
     exit 1
 fi
 